@@ -1,5 +1,6 @@
 import time
 import logging
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from miio import Device, DeviceException
 
@@ -12,62 +13,93 @@ bulbs = [
     {"ip": "194.168.0.987", "token": "insert_token3"},
 ]
 
+_device_lock = threading.Lock()
+
+def _device_for(bulb):
+    """Return the cached Device for the bulb, creating it on first use."""
+    with _device_lock:
+        if "_dev" not in bulb:
+            bulb["_dev"] = Device(bulb['ip'], bulb['token'])
+            bulb["_lock"] = threading.Lock()
+    return bulb["_dev"]
+
+def _send(bulb, command, params):
+    """Send a command through the bulb's cached Device, one call at a time."""
+    device = _device_for(bulb)
+    with bulb["_lock"]:
+        return device.send(command, params)
+
 def power_on(bulb):
     """Turn on the bulb."""
     try:
-        device = Device(bulb['ip'], bulb['token'])
-        device.send("set_power", ["on"])
+        _send(bulb, "set_power", ["on"])
+        # Brightness may have changed while the bulb was off
+        bulb["_last_bri"] = None
         logger.info(f"Bulb {bulb['ip']} turned on")
     except DeviceException as e:
         logger.error(f"Error turning on bulb {bulb['ip']}: {e}")
 
 def set_brightness(bulb, brightness):
-    """Set the brightness of the bulb."""
+    """Set the brightness of the bulb, skipping it if already at that level."""
+    if bulb.get("_last_bri") == brightness:
+        return
     try:
-        device = Device(bulb['ip'], bulb['token'])
-        result = device.send("set_bright", [brightness])
+        result = _send(bulb, "set_bright", [brightness])
         if result == ["ok"]:
+            bulb["_last_bri"] = brightness
             logger.info(f"Brightness of {bulb['ip']} set to {brightness}%")
         else:
             logger.warning(f"Failed to set brightness on {bulb['ip']}")
     except DeviceException as e:
         logger.error(f"Connection error with {bulb['ip']}: {e}")
 
-def turn_on_all_bulbs_smoothly(bulbs):
+def turn_on_all_bulbs_smoothly(bulbs, executor=None):
     """Turn on all bulbs simultaneously and immediately set brightness to 1%."""
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(bulbs)) as executor:
+            turn_on_all_bulbs_smoothly(bulbs, executor)
+        return
+
     logger.info("Turning on all bulbs simultaneously...")
 
     # Turn on all bulbs in parallel
-    with ThreadPoolExecutor(max_workers=len(bulbs)) as executor:
-        executor.map(power_on, bulbs)
+    list(executor.map(power_on, bulbs))
 
     # Minimal wait to let devices register 'on' state
     time.sleep(0.1)  # was 0.3 → now ultra-fast
 
     # Set brightness to 1% simultaneously
-    with ThreadPoolExecutor(max_workers=len(bulbs)) as executor:
-        executor.map(lambda b: set_brightness(b, 1), bulbs)
+    list(executor.map(lambda b: set_brightness(b, 1), bulbs))
 
     logger.info("All bulbs set to 1% brightness.")
 
-def morning_light(bulbs, total_time=600, steps=100):
-    """Gradually increase brightness to 100% over a specified time."""
-    logger.info(f"Starting morning light simulation on {len(bulbs)} bulbs")
+def morning_light(bulbs, total_time=600, steps=20, min_delta=1):
+    """Gradually increase brightness to 100% over a specified time.
 
-    # First, set all bulbs to 1% brightness
-    turn_on_all_bulbs_smoothly(bulbs)
+    Brightness follows a gamma curve, so a few steps look as smooth as a
+    long linear ramp. Steps that change brightness by less than
+    `min_delta` are skipped (the final step always goes out).
+    """
+    logger.info(f"Starting morning light simulation on {len(bulbs)} bulbs")
 
     wait_time = total_time / steps
-    brightness_increment = 100 / steps
+    last_brightness = 1
 
-    for step in range(1, steps + 1):  # start from 1%
-        brightness = int(step * brightness_increment)
-        logger.info(f"Setting brightness to {brightness}% ({step}/{steps})")
-        with ThreadPoolExecutor(max_workers=len(bulbs)) as executor:
-            executor.map(lambda b: set_brightness(b, brightness), bulbs)
-        time.sleep(wait_time)
+    # One pool for the whole ramp instead of one per step
+    with ThreadPoolExecutor(max_workers=len(bulbs)) as executor:
+        # First, set all bulbs to 1% brightness
+        turn_on_all_bulbs_smoothly(bulbs, executor)
+
+        for step in range(1, steps + 1):
+            brightness = max(1, int(100 * (step / steps) ** 2.2))
+            last_step = step == steps and brightness != last_brightness
+            if brightness - last_brightness >= min_delta or last_step:
+                logger.info(f"Setting brightness to {brightness}% ({step}/{steps})")
+                list(executor.map(lambda b: set_brightness(b, brightness), bulbs))
+                last_brightness = brightness
+            time.sleep(wait_time)
 
     logger.info("Morning light simulation completed!")
 
 if __name__ == "__main__":
-    morning_light(bulbs, total_time=600, steps=100)
+    morning_light(bulbs, total_time=600, steps=20)